@@ -15,6 +15,11 @@ TILE_TREE = "Y"
 TILE_LOG = "L"
 TILE_STOCK = "P"
 
+# Tiles a shelter can be built over
+BUILDABLE_TILES = {TILE_EMPTY, TILE_TREE, TILE_LOG, TILE_STOCK}
+# Radii of the clear-tile counts kept per cell (tent and cabin clearance)
+CLEARANCE_RADII = (1, 2)
+
 class TimePeriod(Enum):
     DAWN = auto()
     MORNING = auto()
@@ -63,7 +68,65 @@ class Survivor:
         self.sleep_accumulated = 0  # minutes
         self.sleep_deficit = 0
         self.max_sleep_per_day = MAX_SLEEP_HOURS * 60  # minutes
+        # Derived-state caches, kept in sync by set_tile and set_shelter_tiles
+        self.rebuild_world_cache()
+        self.set_shelter_tiles(self.shelter["tiles"])
     
+    def count_around(self, x, y, radius, tiles):
+        count = 0
+        for dy in range(-radius, radius+1):
+            for dx in range(-radius, radius+1):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height and world[ny][nx] in tiles:
+                    count += 1
+        return count
+
+    def rebuild_world_cache(self):
+        # Per-cell counts of trees within 1 tile and buildable tiles within each clearance radius
+        self.tree_counts = [[self.count_around(x, y, 1, (TILE_TREE,)) for x in range(width)]
+                            for y in range(height)]
+        self.clear_counts = {
+            radius: [[self.count_around(x, y, radius, BUILDABLE_TILES) for x in range(width)]
+                     for y in range(height)]
+            for radius in CLEARANCE_RADII
+        }
+
+    def adjust_counts(self, counts, x, y, radius, delta):
+        for dy in range(-radius, radius+1):
+            for dx in range(-radius, radius+1):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height:
+                    counts[ny][nx] += delta
+
+    def set_tile(self, x, y, tile):
+        old = world[y][x]
+        if old == tile:
+            return
+        world[y][x] = tile
+        tree_delta = (tile == TILE_TREE) - (old == TILE_TREE)
+        if tree_delta:
+            self.adjust_counts(self.tree_counts, x, y, 1, tree_delta)
+        clear_delta = (tile in BUILDABLE_TILES) - (old in BUILDABLE_TILES)
+        if clear_delta:
+            for radius, counts in self.clear_counts.items():
+                self.adjust_counts(counts, x, y, radius, clear_delta)
+
+    def set_shelter_tiles(self, tiles):
+        self.shelter["tiles"] = tiles
+        self.shelter_cells = {(tx, ty): sym for tx, ty, sym in tiles}
+        if tiles:
+            self.shelter_center = (
+                sum(tx for tx, _, _ in tiles) // len(tiles),
+                sum(ty for _, ty, _ in tiles) // len(tiles)
+            )
+        else:
+            self.shelter_center = None
+        # Cells within 2 tiles of the shelter, where a lumber stockpile may go
+        self.stockpile_cells = {(tx + dx, ty + dy)
+                                for tx, ty in self.shelter_cells
+                                for dy in range(-2, 3)
+                                for dx in range(-2, 3)}
+
 
     def update_time(self):
         self.time += TIME_STEP_MINUTES
@@ -163,7 +226,7 @@ class Survivor:
     def can_chop_here(self, x, y):
         return (0 <= x < width and 0 <= y < height and 
                 world[y][x] == "Y" and 
-                (x, y) not in [(tx, ty) for tx, ty, _ in self.shelter["tiles"]])
+                (x, y) not in self.shelter_cells)
 
     def chop_tree(self):
         if self.energy < 15:
@@ -173,7 +236,7 @@ class Survivor:
             for dx in range(-1, 2):
                 x, y = self.x + dx, self.y + dy
                 if self.can_chop_here(x, y):
-                    world[y][x] = "L"
+                    self.set_tile(x, y, "L")
                     self.energy -= 15
                     self.skills["building"] += 0.2
                     self.current_action = "Chopped tree into logs"
@@ -191,9 +254,8 @@ class Survivor:
                     0 <= y < height and
                     world[y][x] == "." and
                     (abs(dx) + abs(dy)) > 0 and  # Don't place on self
-                    any(abs(tx - x) <= 2 and abs(ty - y) <= 2 
-                        for tx, ty, _ in self.shelter["tiles"])):
-                    world[y][x] = "P"
+                    (x, y) in self.stockpile_cells):
+                    self.set_tile(x, y, "P")
                     self.energy -= 10
                     self.current_action = "Created lumber stockpile"
                     return True
@@ -207,7 +269,7 @@ class Survivor:
             for dx in range(-1, 2):
                 x, y = self.x + dx, self.y + dy
                 if 0 <= x < width and 0 <= y < height and world[y][x] == "L":
-                    world[y][x] = "."
+                    self.set_tile(x, y, ".")
                     self.energy -= 5
                     self.current_action = "Gathered logs"
                     self.shelter["logs"] += 1
@@ -215,14 +277,14 @@ class Survivor:
         return False
 
     def can_build_here(self, size):
-        for dy in range(-size, size+1):
-            for dx in range(-size, size+1):
-                x, y = self.x + dx, self.y + dy
-                if not (0 <= x < width and 0 <= y < height):
-                    return False
-                if world[y][x] not in [".", "Y", "L", "P"]:
-                    return False
-        return True
+        if not (size <= self.x < width - size and size <= self.y < height - size):
+            return False
+        counts = self.clear_counts.get(size)
+        if counts is None:
+            clear = self.count_around(self.x, self.y, size, BUILDABLE_TILES)
+        else:
+            clear = counts[self.y][self.x]
+        return clear == (2 * size + 1) ** 2
     
     def build_shelter(self):
         if self.sleeping:
@@ -241,12 +303,7 @@ class Survivor:
             return False
             
         if self.shelter["level"] == 0:
-            adjacent_trees = 0
-            for dy in range(-1, 2):
-                for dx in range(-1, 2):
-                    if world[self.y + dy][self.x + dx] == "Y":
-                        adjacent_trees += 1
-            if adjacent_trees < 3:
+            if self.tree_counts[self.y][self.x] < 3:
                 self.current_action = "Need more trees nearby!"
                 return False
         
@@ -254,12 +311,13 @@ class Survivor:
         self.energy -= 10
         
         if self.shelter["level"] == 0:
-            self.shelter["tiles"] = []
+            tiles = []
             for dy in range(-1, 2):
                 for dx in range(-1, 2):
                     if not (dx == 0 and dy == 0) and not (dx == -1 and dy == 0):
-                        self.shelter["tiles"].append((self.x + dx, self.y + dy, "T"))
-                        world[self.y + dy][self.x + dx] = "T"
+                        tiles.append((self.x + dx, self.y + dy, "T"))
+                        self.set_tile(self.x + dx, self.y + dy, "T")
+            self.set_shelter_tiles(tiles)
             
             self.shelter["level"] = 1
             self.shelter["type"] = "tent"
@@ -270,14 +328,15 @@ class Survivor:
             return True
             
         elif self.shelter["level"] == 1 and self.skills["building"] >= 1.5:
-            self.shelter["tiles"] = []
+            tiles = []
             for dy in range(-2, 3):
                 for dx in range(-2, 3):
                     is_wall = (abs(dx) == 2 or abs(dy) == 2)
                     is_entrance = (dx == -2 and dy == 0)
                     if is_wall and not is_entrance:
-                        self.shelter["tiles"].append((self.x + dx, self.y + dy, "C"))
-                        world[self.y + dy][self.x + dx] = "C"
+                        tiles.append((self.x + dx, self.y + dy, "C"))
+                        self.set_tile(self.x + dx, self.y + dy, "C")
+            self.set_shelter_tiles(tiles)
             
             self.shelter["level"] = 2
             self.shelter["type"] = "cabin"
@@ -401,13 +460,10 @@ class Survivor:
         return False
 
     def move_toward_shelter(self):
-        if not self.shelter["tiles"]:
+        if self.shelter_center is None:
             return False
             
-        shelter_center = (
-            sum(x for x, y, _ in self.shelter["tiles"]) // len(self.shelter["tiles"]),
-            sum(y for x, y, _ in self.shelter["tiles"]) // len(self.shelter["tiles"])
-        )
+        shelter_center = self.shelter_center
         
         dx = 1 if shelter_center[0] > self.x else -1 if shelter_center[0] < self.x else 0
         dy = 1 if shelter_center[1] > self.y else -1 if shelter_center[1] < self.y else 0
@@ -607,8 +663,7 @@ def draw_world(survivor):
                 row.append(f"{player_color}@\033[0m")
                 continue
                 
-            shelter_tile = next((sym for (tx, ty, sym) in survivor.shelter["tiles"] 
-                              if tx == x and ty == y), None)
+            shelter_tile = survivor.shelter_cells.get((x, y))
             if shelter_tile:
                 row.append(shelter_tile)
             elif (x, y) == survivor.shelter.get("bed_pos"):
@@ -634,7 +689,7 @@ def draw_world(survivor):
                     colored = tile
                 
                 if survivor.time_period == TimePeriod.NIGHT:
-                    if any(tx == x and ty == y for (tx, ty, _) in survivor.shelter["tiles"]):
+                    if (x, y) in survivor.shelter_cells:
                         row.append(colored)
                     else:
                         row.append("\033[90m" + colored + "\033[0m")